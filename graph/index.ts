@@ -22,7 +22,7 @@ import { unsupportedNode } from "./nodes/unsupportedNode.js";
  * To add a new agent:
  * 1. Add intent to types/intents.ts
  * 2. Update classifyIntent.ts prompt
- * 3. Add case to routeByIntent() in nodes/router.ts
+ * 3. Add the route to NODE_BY_INTENT in nodes/supervisor/router.ts
  * 4. Create agent node in nodes/
  * 5. Add node and edge below
  */
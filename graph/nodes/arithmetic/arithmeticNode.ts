@@ -1,11 +1,12 @@
 import { createReactAgent } from "@langchain/langgraph/prebuilt";
-import { SystemMessage } from "@langchain/core/messages";
+import { SystemMessage, AIMessage } from "@langchain/core/messages";
 import { loadModel } from "../../../utils/agents/loadModel.js";
 import { arithmeticTools } from "./tools.js";
 import { extractLastToolJson } from "../../../utils/agents/extractLastToolJson.js";
 import type { AgentStateType } from "../../state.js";
+import { AGENT_RECURSION_LIMIT } from "../../../utils/config.js";
 
-const model = loadModel("standard");
+const model = await loadModel("standard");
 
 const arithmeticSystemPrompt = `
 You are a helpful arithmetic assistant.
@@ -44,7 +45,21 @@ export async function arithmeticNode(
   state: AgentStateType,
 ): Promise<Partial<AgentStateType>> {
   const inputMessageCount = state.messages.length;
-  const result = await arithmeticAgent.invoke({ messages: state.messages });
+
+  let result;
+  try {
+    result = await arithmeticAgent.invoke(
+      { messages: state.messages },
+      { recursionLimit: AGENT_RECURSION_LIMIT },
+    );
+  } catch (error) {
+    // e.g. GraphRecursionError when the agent exceeds AGENT_RECURSION_LIMIT
+    console.error("[arithmeticNode] Agent error:", error);
+    const errorMessage = new AIMessage(
+      "Something went wrong. Please try again later.",
+    );
+    return { messages: [errorMessage] };
+  }
 
   // Check if tools were called THIS turn by looking at new messages only
   const newMessages = result.messages.slice(inputMessageCount);
@@ -52,14 +67,14 @@ export async function arithmeticNode(
 
   // If no tools were called, the agent is asking for clarification
   if (!toolsCalledThisTurn) {
-    return { messages: result.messages };
+    return { messages: newMessages };
   }
 
   // Extract the arithmetic result from the last tool call
   const value = extractLastToolJson<number>(result.messages);
 
   return {
-    messages: result.messages,
+    messages: newMessages,
     data: {
       type: "arithmetic",
       options: { value },
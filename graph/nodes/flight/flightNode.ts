@@ -1,5 +1,6 @@
 import { createReactAgent } from "@langchain/langgraph/prebuilt";
 import { SystemMessage, AIMessage } from "@langchain/core/messages";
+import type { BaseMessage } from "@langchain/core/messages";
 import { loadModel } from "../../../utils/agents/loadModel.js";
 import { flightTools } from "./tools.js";
 import { summarizeFlights } from "./utils/summarizeFlights.js";
@@ -13,11 +14,14 @@ import type {
 } from "../../../types/flight/flights.js";
 import type { AgentStateType } from "../../state.js";
 import type { Trip } from "../../../types/trip.js";
+import { createEmptyTrip } from "../../../types/trip.js";
+import {
+  USE_FLIGHT_API,
+  GENERATE_SUMMARIES,
+  AGENT_RECURSION_LIMIT,
+} from "../../../utils/config.js";
 
-const useFlightApi = process.env.USE_FLIGHT_API === "false";
-const GENERATE_SUMMARIES = process.env.GENERATE_SUMMARIES === "true";
-
-const model = loadModel("fast");
+const model = await loadModel("fast");
 
 function getMissingFields(trip: Trip): string[] {
   const missing: string[] = [];
@@ -51,25 +55,12 @@ function createFlightTemplate(): FlightResults {
   };
 }
 
-function buildSystemPrompt(trip: Trip): string {
-  const missingFields = getMissingFields(trip);
-  const tripContext = `
-Current trip details:
-- Origin: ${trip.origin || "not specified"}
-- Destination: ${trip.destination || "not specified"}
-- City: ${trip.city || "not specified"}
-- Departure date: ${trip.departureDate || "not specified"}
-- Return date: ${trip.returnDate || "not specified"}
-- Budget: ${trip.budget ? `$${trip.budget}` : "not specified"}
-
-${missingFields.length > 0 ? `Missing required information: ${missingFields.join(", ")}` : "All required flight information is available."}
-`;
-
-  return `
+// The instructions come before the per-trip details so every request shares
+// an identical prompt prefix, which providers can serve from their prompt
+// cache instead of reprocessing it each call
+const FLIGHT_INSTRUCTIONS = `
 You are a helpful flight research assistant helping plan a trip.
 
-${tripContext}
-
 You can search for round-trip flights using the tools available to you.
 Each tool has specific required parameters - review them carefully.
 
@@ -82,22 +73,51 @@ Rules:
 - Be CONCISE. Keep responses short (1-2 sentences max).
 - Do NOT format or present detailed results to the user (that's handled separately).
 - If the user provides an airline, convert the airline name to its 2-character IATA code.
-- When calling searchFlights, pass cityName if the destination city name is known (use the City field from trip details above).
+- When calling searchFlights, pass cityName if the destination city name is known (use the City field from the trip details below).
+`;
+
+function buildSystemPrompt(trip: Trip): string {
+  const missingFields = getMissingFields(trip);
+
+  return `${FLIGHT_INSTRUCTIONS}
+Current trip details:
+- Origin: ${trip.origin || "not specified"}
+- Destination: ${trip.destination || "not specified"}
+- City: ${trip.city || "not specified"}
+- Departure date: ${trip.departureDate || "not specified"}
+- Return date: ${trip.returnDate || "not specified"}
+- Budget: ${trip.budget ? `$${trip.budget}` : "not specified"}
+
+${missingFields.length > 0 ? `Missing required information: ${missingFields.join(", ")}` : "All required flight information is available."}
 `;
 }
 
+/* Built once at import rather than per request. The system prompt depends
+ * on the trip, so it is rendered on each run from config.configurable.trip.
+ */
+const flightAgent = createReactAgent({
+  llm: model,
+  tools: flightTools,
+  prompt: (state, config) => [
+    new SystemMessage(
+      buildSystemPrompt(
+        (config.configurable?.trip as Trip | undefined) ?? createEmptyTrip(),
+      ),
+    ),
+    ...state.messages,
+  ],
+});
+
 /**
  * Flight agent node — uses Amadeus API (USE_FLIGHT_API=true) or
  * LLM-generated data via the generator utility (USE_FLIGHT_API=false).
+ * The flag is fixed for the life of the process, so the path is chosen once.
  */
-export async function flightNode(
+export const flightNode: (
   state: AgentStateType,
-): Promise<Partial<AgentStateType>> {
-  if (useFlightApi) {
-    return flightNodeWithApi(state);
-  }
-  return flightNodeWithGenerator(state);
-}
+) => Promise<Partial<AgentStateType>> = USE_FLIGHT_API
+  ? flightNodeWithApi
+  : flightNodeWithGenerator;
 
 /**
  * API path: uses createReactAgent with the searchFlights tool (Amadeus API).
@@ -106,26 +126,23 @@ async function flightNodeWithApi(
   state: AgentStateType,
 ): Promise<Partial<AgentStateType>> {
   const inputMessageCount = state.messages.length;
-  let currentMessages = state.messages;
+  // Only messages added this turn are returned; the messages reducer
+  // appends them to the existing history
+  let newMessages: BaseMessage[] = [];
   const trip = state.trip;
 
   try {
-    const flightAgent = createReactAgent({
-      llm: model,
-      tools: flightTools,
-      messageModifier: new SystemMessage(buildSystemPrompt(trip)),
-    });
-
-    const result = await flightAgent.invoke({ messages: state.messages });
-    currentMessages = result.messages;
-
+    const result = await flightAgent.invoke(
+      { messages: state.messages },
+      { configurable: { trip }, recursionLimit: AGENT_RECURSION_LIMIT },
+    );
     // Check if tools were called THIS turn by looking at new messages only
-    const newMessages = result.messages.slice(inputMessageCount);
+    newMessages = result.messages.slice(inputMessageCount);
     const toolsCalledThisTurn = newMessages.some((m) => m.type === "tool");
 
     // If no tools were called, the agent is asking for clarification
     if (!toolsCalledThisTurn) {
-      return { messages: result.messages };
+      return { messages: newMessages };
     }
 
     // Post-process flight results
@@ -144,7 +161,7 @@ async function flightNodeWithApi(
       const errorMessage = new AIMessage(errorMsg);
 
       return {
-        messages: [...result.messages, errorMessage],
+        messages: [...newMessages, errorMessage],
         data: {
           type: "error",
           message: errorMsg,
@@ -161,7 +178,7 @@ async function flightNodeWithApi(
       const errorMessage = new AIMessage(
         "Something went wrong. Please try again later.",
       );
-      return { messages: [...result.messages, errorMessage] };
+      return { messages: [...newMessages, errorMessage] };
     }
 
     // Summarize the flights - non-fatal if LLM call fails
@@ -181,7 +198,7 @@ async function flightNodeWithApi(
 
     // Return updated state with data extracted
     return {
-      messages: [...result.messages, finalMessage],
+      messages: [...newMessages, finalMessage],
       data: {
         type: "flight",
         summary,
@@ -193,7 +210,7 @@ async function flightNodeWithApi(
     const errorMessage = new AIMessage(
       "Something went wrong. Please try again later.",
     );
-    return { messages: [...currentMessages, errorMessage] };
+    return { messages: [...newMessages, errorMessage] };
   }
 }
 
@@ -218,7 +235,7 @@ Missing: ${missingFields.join(", ")}`),
     ]);
 
     const aiMessage = new AIMessage(response.content as string);
-    return { messages: [...state.messages, aiMessage] };
+    return { messages: [aiMessage] };
   }
 
   try {
@@ -235,7 +252,7 @@ Missing: ${missingFields.join(", ")}`),
     const aiMessage = new AIMessage(summary || "Here are your flight options.");
 
     return {
-      messages: [...state.messages, aiMessage],
+      messages: [aiMessage],
       data: {
         type: "flight",
         summary,
@@ -247,6 +264,6 @@ Missing: ${missingFields.join(", ")}`),
     const errorMessage = new AIMessage(
       "Something went wrong finding flights. Please try again later.",
     );
-    return { messages: [...state.messages, errorMessage] };
+    return { messages: [errorMessage] };
   }
 }
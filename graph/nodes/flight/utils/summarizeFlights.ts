@@ -6,7 +6,20 @@ import {
 import type { FlightResults } from "../../../../types/flight/flights.js";
 import { loadModel } from "../../../../utils/agents/loadModel.js";
 
-const model = loadModel("standard");
+const model = await loadModel("standard");
+
+const summarySystemMessage = new SystemMessage(`
+      You are a travel assistant.
+
+      Your job is to summarize flight options for a user.
+
+      Rules:
+      - Do NOT invent data
+      - Only use the provided flight JSON
+      - Be concise and helpful
+      - Compare price, duration, and stops
+      - Recommend an option if clearly better
+    `);
 
 export async function summarizeFlights(
   flights: FlightResults[],
@@ -19,18 +32,7 @@ export async function summarizeFlights(
     .join("\n");
 
   const response = await model.invoke([
-    new SystemMessage(`
-      You are a travel assistant.
-
-      Your job is to summarize flight options for a user.
-
-      Rules:
-      - Do NOT invent data
-      - Only use the provided flight JSON
-      - Be concise and helpful
-      - Compare price, duration, and stops
-      - Recommend an option if clearly better
-    `),
+    summarySystemMessage,
     new HumanMessage(`
       User request:
       ${userMessages}
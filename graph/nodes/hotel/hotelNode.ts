@@ -10,12 +10,17 @@ import type { AgentStateType } from "../../state.js";
 import type { Trip } from "../../../types/trip.js";
 import { nanoid } from "nanoid";
 import { searchNearbyPlaces } from "../../../tools/travel/searchNearbyPlaces.js";
+import {
+  USE_PLACES_API,
+  GENERATE_SUMMARIES,
+} from "../../../utils/config.js";
 import { validateAirportCode } from "../../../tools/travel/validateAirport.js";
 
-const USE_PLACES_API = process.env.USE_PLACES_API === "true";
-const GENERATE_SUMMARIES = process.env.GENERATE_SUMMARIES === "true";
+const model = await loadModel("smart");
 
-const model = loadModel("smart");
+const summarySystemMessage = new SystemMessage(`You are a helpful hotel assistant.
+Briefly summarize these hotel recommendations in 2-3 sentences.
+Be concise and helpful.`);
 
 function getMissingFields(trip: Trip): string[] {
   const missing: string[] = [];
@@ -81,7 +86,7 @@ Missing: ${missingFields.join(", ")}`),
     ]);
 
     const aiMessage = new AIMessage(response.content as string);
-    return { messages: [...state.messages, aiMessage] };
+    return { messages: [aiMessage] };
   }
 
   try {
@@ -116,9 +121,7 @@ Missing: ${missingFields.join(", ")}`),
     let aiMessage: AIMessage;
     if (GENERATE_SUMMARIES) {
       const summaryResponse = await model.invoke([
-        new SystemMessage(`You are a helpful hotel assistant.
-Briefly summarize these hotel recommendations in 2-3 sentences.
-Be concise and helpful.`),
+        summarySystemMessage,
         new HumanMessage(JSON.stringify(hotels, null, 2)),
       ]);
       summary = summaryResponse.content as string;
@@ -128,7 +131,7 @@ Be concise and helpful.`),
     }
 
     return {
-      messages: [...state.messages, aiMessage],
+      messages: [aiMessage],
       data: {
         type: "hotel",
         summary,
@@ -139,6 +142,6 @@ Be concise and helpful.`),
     const errorMessage = new AIMessage(
       "Something went wrong finding hotels. Please try again later.",
     );
-    return { messages: [...state.messages, errorMessage] };
+    return { messages: [errorMessage] };
   }
 }
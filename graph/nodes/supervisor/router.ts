@@ -1,5 +1,19 @@
 import { classifyIntent } from "./utils/classifyIntent.js";
 import type { AgentStateType } from "../../state.js";
+import type { Intent } from "../../../types/intents.js";
+
+// Graph node that handles each intent. Typed over every Intent so adding an
+// intent without a route is a compile error rather than a silent fallback.
+const NODE_BY_INTENT: Readonly<Record<Intent, string>> = {
+  activities: "activityAgent",
+  arithmetic: "arithmeticAgent",
+  flights: "flightAgent",
+  hotel: "hotelAgent",
+  nature: "natureAgent",
+  restaurant: "restaurantAgent",
+  selfie: "selfieAgent",
+  unsupported: "unsupportedNode",
+};
 
 /**
  * Router node that classifies the user's intent.
@@ -17,29 +31,11 @@ export async function routerNode(
  * To add a new agent:
  * 1. Add the intent to types/intents.ts
  * 2. Update classifyIntent.ts prompt
- * 3. Add a case here
+ * 3. Add an entry to NODE_BY_INTENT
  * 4. Create the agent node
  * 5. Wire into the graph
  */
 export function routeByIntent(state: AgentStateType): string {
   const { intent } = state;
-
-  switch (intent) {
-    case "arithmetic":
-      return "arithmeticAgent";
-    case "flights":
-      return "flightAgent";
-    case "hotel":
-      return "hotelAgent";
-    case "restaurant":
-      return "restaurantAgent";
-    case "selfie":
-      return "selfieAgent";
-    case "activities":
-      return "activityAgent";
-    case "nature":
-      return "natureAgent";
-    default:
-      return "unsupportedNode";
-  }
+  return intent ? NODE_BY_INTENT[intent] : "unsupportedNode";
 }
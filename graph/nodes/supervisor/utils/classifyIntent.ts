@@ -1,24 +1,12 @@
 import { SystemMessage, HumanMessage } from "@langchain/core/messages";
 import type { BaseMessage } from "@langchain/core/messages";
+import { INTENTS } from "../../../../types/intents.js";
 import type { Intent } from "../../../../types/intents.js";
 import { loadModel } from "../../../../utils/agents/loadModel.js";
 
-const model = loadModel("fast");
+const model = await loadModel("fast");
 
-/**
- * Classify the user's request into exactly ONE of the following categories:
- * - arithmetic: simple math involving two numbers
- * - flights: getting flight data between two locations
- * - unsupported: anything else
- *
- * Takes the full conversation history to handle follow-up questions intelligently.
- */
-export async function classifyIntent(messages: BaseMessage[]): Promise<Intent> {
-  // Get the last few messages for context (up to 6 messages = 3 turns)
-  const recentMessages = messages.slice(-6);
-
-  const response = await model.invoke([
-    new SystemMessage(`
+const classifierSystemMessage = new SystemMessage(`
     You are an intent classifier.
 
     Classify the user's LATEST request into exactly ONE of the following categories:
@@ -91,13 +79,34 @@ export async function classifyIntent(messages: BaseMessage[]): Promise<Intent> {
     { "intent": "activities" }
     { "intent": "nature" }
     { "intent": "unsupported" }
-    `),
-    ...recentMessages,
-  ]);
+    `);
+
+// Intents the router understands; anything else the model returns is unsupported
+const VALID_INTENTS: ReadonlySet<string> = new Set(INTENTS);
+
+/**
+ * Classify the user's request into exactly ONE of the following categories:
+ * - arithmetic: simple math involving two numbers
+ * - flights: getting flight data between two locations
+ * - unsupported: anything else
+ *
+ * Takes the full conversation history to handle follow-up questions intelligently.
+ */
+export async function classifyIntent(messages: BaseMessage[]): Promise<Intent> {
+  // Get the last few messages for context (up to 6 messages = 3 turns)
+  const recentMessages = messages.slice(-6);
+
+  // Tagged "nostream" so the raw JSON isn't sent as tokens on /chat/stream
+  const response = await model.invoke(
+    [classifierSystemMessage, ...recentMessages],
+    { tags: ["nostream"] },
+  );
 
   try {
     const parsed = JSON.parse(response.text);
-    return parsed.intent as Intent;
+    return VALID_INTENTS.has(parsed?.intent)
+      ? (parsed.intent as Intent)
+      : "unsupported";
   } catch {
     return "unsupported";
   }
@@ -8,9 +8,30 @@ import {
   fetchWikipediaSectionContent,
   fetchWikipediaFullExtract,
 } from "../../../tools/travel/searchWikipedia.js";
-import type { GroupedContent } from "../../../tools/travel/searchWikipedia.js";
+import type {
+  ClassifiedSection,
+  GroupedContent,
+} from "../../../tools/travel/searchWikipedia.js";
 import { classifySections } from "./utils/classifySections.js";
 import { analyzeTips } from "./utils/analyzeTips.js";
+import { createTtlCache } from "../../../utils/cache/ttlCache.js";
+
+// Categories the model may assign; anything else is dropped before grouping
+const TIP_CATEGORIES: ReadonlySet<string> = new Set<keyof GroupedContent>([
+  "transportation",
+  "safety",
+  "whenToVisit",
+]);
+
+// Which sections of a city's article hold tips depends only on the article,
+// so the LLM classification is cached by page id alongside the Wikipedia
+// response cache. Only usable classifications are cached, so one bad reply
+// doesn't pin a city to the fallback. Tips themselves depend on the trip
+// dates and are not cached.
+const classifiedSectionsCache = createTtlCache<number, ClassifiedSection[]>({
+  maxSize: 200,
+  ttlMs: 60 * 60 * 1000, // 1 hour
+});
 
 function buildTripContext(trip: Trip): Record<string, unknown> {
   return {
@@ -69,7 +90,23 @@ export async function generateTips(trip: Trip): Promise<Tips[]> {
     }
 
     // Step 3: LLM classifies which sections are relevant
-    const classified = await classifySections(sections, trip.city);
+    let classified = classifiedSectionsCache.get(pageId);
+    if (!classified) {
+      classified = (await classifySections(sections, trip.city)).filter(
+        (section) => TIP_CATEGORIES.has(section.category),
+      );
+      if (classified.length > 0) {
+        classifiedSectionsCache.set(pageId, classified);
+      }
+    }
+
+    // A category with no classified sections is certain to need the full
+    // extract fallback, so start that fetch now alongside the section fetches
+    const coveredCategories = new Set(classified.map((s) => s.category));
+    const fullExtractPromise =
+      coveredCategories.size < TIP_CATEGORIES.size
+        ? fetchWikipediaFullExtract(pageId)
+        : null;
 
     // Step 4: Fetch all relevant section content in parallel (HTML already stripped)
     const sectionContents = await Promise.all(
@@ -101,7 +138,8 @@ export async function generateTips(trip: Trip): Promise<Tips[]> {
       grouped.whenToVisit.length === 0;
 
     if (needsFullExtract) {
-      const fullText = await fetchWikipediaFullExtract(pageId);
+      const fullText = await (fullExtractPromise ??
+        fetchWikipediaFullExtract(pageId));
       if (fullText !== null) {
         if (grouped.transportation.length === 0)
           grouped.transportation = [fullText];
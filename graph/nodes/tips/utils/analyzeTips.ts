@@ -3,9 +3,28 @@ import type { Tips } from "../../../../types/tips/tips.js";
 import type { Trip } from "../../../../types/trip.js";
 import type { GroupedContent } from "../../../../tools/travel/searchWikipedia.js";
 import { loadModel } from "../../../../utils/agents/loadModel.js";
+import { parseModelJson } from "../../../../utils/agents/parseModelJson.js";
 import { nanoid } from "nanoid";
 
-const model = loadModel("fast");
+const model = await loadModel("fast");
+
+const tipsWriterSystemMessage = new SystemMessage(`
+      You are a travel tips writer. Your job is to produce concise, accurate travel tips
+      grounded in the provided Wikipedia source material.
+
+      Rules:
+      - Each tip MUST be 2-4 sentences, prose only (no bullet points)
+      - Base your writing on the provided source material — do not invent specific facts
+      - Write in a friendly, direct tone suitable for a traveler
+      - Return JSON ONLY — no markdown, no explanation
+
+      Output format:
+      {
+        "transportTips": "...",
+        "safetyTips": "...",
+        "whenToVisitTips": "..."
+      }
+    `);
 
 /**
  * Uses an LLM to analyze grouped Wikipedia content and generate all three
@@ -32,23 +51,7 @@ export async function analyzeTips(
       : "(No specific Wikipedia content found — write general seasonal advice for this destination)";
 
   const response = await model.invoke([
-    new SystemMessage(`
-      You are a travel tips writer. Your job is to produce concise, accurate travel tips
-      grounded in the provided Wikipedia source material.
-
-      Rules:
-      - Each tip MUST be 2-4 sentences, prose only (no bullet points)
-      - Base your writing on the provided source material — do not invent specific facts
-      - Write in a friendly, direct tone suitable for a traveler
-      - Return JSON ONLY — no markdown, no explanation
-
-      Output format:
-      {
-        "transportTips": "...",
-        "safetyTips": "...",
-        "whenToVisitTips": "..."
-      }
-    `),
+    tipsWriterSystemMessage,
     new HumanMessage(`
       Destination: ${trip.city}
       Travel dates: ${trip.departureDate ?? "unspecified"} to ${trip.returnDate ?? "unspecified"}
@@ -67,21 +70,11 @@ export async function analyzeTips(
     `),
   ]);
 
-  const text = (response.content as string).trim();
-  let parsed: {
+  const parsed = parseModelJson<{
     transportTips: string;
     safetyTips: string;
     whenToVisitTips: string;
-  };
-
-  try {
-    parsed = JSON.parse(text) as typeof parsed;
-  } catch {
-    const stripped = text
-      .replace(/^```(?:json)?\s*\n?/i, "")
-      .replace(/\n?```\s*$/i, "");
-    parsed = JSON.parse(stripped) as typeof parsed;
-  }
+  }>(response.content as string);
 
   return {
     id: nanoid(),
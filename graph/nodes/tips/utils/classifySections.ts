@@ -4,20 +4,11 @@ import type {
   ClassifiedSection,
 } from "../../../../tools/travel/searchWikipedia.js";
 import { loadModel } from "../../../../utils/agents/loadModel.js";
+import { parseModelJson } from "../../../../utils/agents/parseModelJson.js";
 
-const model = loadModel("fast");
+const model = await loadModel("fast");
 
-/**
- * Uses an LLM to identify which Wikipedia sections are relevant to the three
- * tip categories: transportation, safety, and whenToVisit.
- * Returns an empty array if classification fails or no sections match.
- */
-export async function classifySections(
-  sections: WikipediaSection[],
-  city: string,
-): Promise<ClassifiedSection[]> {
-  const response = await model.invoke([
-    new SystemMessage(`
+const classifierSystemMessage = new SystemMessage(`
       You are a Wikipedia section classifier for travel content.
 
       Your job: given a list of Wikipedia article sections for a travel destination,
@@ -39,7 +30,20 @@ export async function classifySections(
         { "index": "3", "line": "Transport", "category": "transportation" },
         { "index": "7", "line": "Climate", "category": "whenToVisit" }
       ]
-    `),
+    `);
+
+/**
+ * Uses an LLM to identify which Wikipedia sections are relevant to the three
+ * tip categories: transportation, safety, and whenToVisit.
+ * Each section appears at most once, so callers fetch it only once.
+ * Returns an empty array if classification fails or no sections match.
+ */
+export async function classifySections(
+  sections: WikipediaSection[],
+  city: string,
+): Promise<ClassifiedSection[]> {
+  const response = await model.invoke([
+    classifierSystemMessage,
     new HumanMessage(`
       City: ${city}
 
@@ -50,22 +54,18 @@ export async function classifySections(
     `),
   ]);
 
-  const text = response.text.trim();
-
   try {
-    const parsed = JSON.parse(text) as unknown;
+    const parsed = parseModelJson<unknown>(response.text);
     if (!Array.isArray(parsed)) return [];
-    return parsed as ClassifiedSection[];
-  } catch {
-    try {
-      const stripped = text
-        .replace(/^```(?:json)?\s*\n?/i, "")
-        .replace(/\n?```\s*$/i, "");
-      const parsed = JSON.parse(stripped) as unknown;
-      if (!Array.isArray(parsed)) return [];
-      return parsed as ClassifiedSection[];
-    } catch {
-      return [];
+
+    // The model sometimes lists a section twice (or under two categories);
+    // keep the first assignment, preserving order
+    const byIndex = new Map<string, ClassifiedSection>();
+    for (const section of parsed as ClassifiedSection[]) {
+      if (!byIndex.has(section.index)) byIndex.set(section.index, section);
     }
+    return [...byIndex.values()];
+  } catch {
+    return [];
   }
 }
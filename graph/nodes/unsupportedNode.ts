@@ -6,11 +6,11 @@ import type { AgentStateType } from "../state.js";
  * Returns a friendly message directing users to supported capabilities.
  */
 export async function unsupportedNode(
-  state: AgentStateType,
+  _state: AgentStateType,
 ): Promise<Partial<AgentStateType>> {
   const message = new AIMessage(
     "I can only help with helping you plan a trip. What would you like to do?",
   );
 
-  return { messages: [...state.messages, message] };
+  return { messages: [message] };
 }
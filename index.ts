@@ -1,107 +1,299 @@
 import "dotenv/config";
 import express from "express";
 import { graph } from "./graph/index.js";
+import type { AgentStateType } from "./graph/state.js";
 import type { BaseMessage } from "@langchain/core/messages";
-import { HumanMessage, AIMessage } from "@langchain/core/messages";
-import type { ChatRequest, ChatResponse, Message, TipsRequest, TipsResponse } from "./types/api.js";
-import { createEmptyTrip } from "./types/trip.js";
+import {
+  HumanMessage,
+  AIMessage,
+  AIMessageChunk,
+} from "@langchain/core/messages";
+import type {
+  ChatBatchRequest,
+  ChatBatchResponse,
+  ChatRequest,
+  ChatResponse,
+  Message,
+  TipsRequest,
+  TipsResponse,
+} from "./types/api.js";
+import { createEmptyTrip, normalizeTrip } from "./types/trip.js";
 import { generateTips } from "./graph/nodes/tips/tipsNode.js";
+import { getAmadeusToken } from "./utils/amadeus/tokenManager.js";
+import { preloadAirports } from "./tools/travel/validateAirport.js";
+import {
+  PORT,
+  USE_FLIGHT_API,
+  isLogLevelEnabled,
+} from "./utils/config.js";
+import { startSse, writeSseEvent } from "./utils/http/sse.js";
+import { compressJson } from "./utils/http/compressJson.js";
+import { createLimiter } from "./utils/async/limiter.js";
 
 type Request = express.Request;
 type Response = express.Response;
 type NextFunction = express.NextFunction;
 
+// Limits for POST /chat/batch
+const MAX_BATCH_SIZE = 20;
+const BATCH_MAX_CONCURRENCY = 5;
+
+// Caps concurrent graph runs across /chat, /chat/batch items, /chat/stream
+// and /tips. Each run fans out into LLM and travel API calls, so an
+// unbounded burst would pile up upstream 429s and slow every request;
+// extra requests queue instead.
+const MAX_CONCURRENT_GRAPH_RUNS = 32;
+const graphRuns = createLimiter(MAX_CONCURRENT_GRAPH_RUNS);
+
+// /health is polled by load balancers; its body never changes
+const HEALTH_BODY = JSON.stringify({ status: "ok" });
+
 const app = express();
-const PORT = process.env.PORT || 8000;
+
+// Express hashes every response body to build an ETag. Chat and tips
+// responses are POST results that are never revalidated, so the hash is
+// pure serialization overhead on large payloads.
+app.set("etag", false);
 
 app.use(express.json());
+app.use(compressJson);
 
-// Request logging middleware
-app.use((req: Request, res: Response, next: NextFunction) => {
-  const start = Date.now();
-  console.log(`[${new Date().toISOString()}] --> ${req.method} ${req.path}`);
+// Request logging middleware, registered only when LOG_LEVEL allows
+// info logs so production (LOG_LEVEL=warn) pays nothing per request.
+// Request bodies hold whole conversations, so they are only dumped at debug.
+if (isLogLevelEnabled("info")) {
+  const logBodies = isLogLevelEnabled("debug");
 
-  if (req.body && Object.keys(req.body).length > 0) {
-    console.log("Request body:", req.body);
-  }
-
-  res.on("finish", () => {
-    const duration = Date.now() - start;
+  app.use((req: Request, res: Response, next: NextFunction) => {
+    const start = Date.now();
     console.log(
-      `[${new Date().toISOString()}] <-- ${req.method} ${req.path} ${res.statusCode} (${duration}ms)`,
+      `[${new Date().toISOString()}] --> ${req.method} ${req.path}`,
     );
-  });
 
-  next();
-});
+    if (logBodies && req.body && Object.keys(req.body).length > 0) {
+      console.log("Request body:", req.body);
+    }
+
+    res.on("finish", () => {
+      const duration = Date.now() - start;
+      console.log(
+        `[${new Date().toISOString()}] <-- ${req.method} ${req.path} ${res.statusCode} (${duration}ms)`,
+      );
+    });
+
+    next();
+  });
+}
 
 app.get("/health", (req: Request, res: Response) => {
-  res.json({ status: "ok" });
+  // A cached "ok" could outlive the instance, so every check must reach it
+  res.set("Cache-Control", "no-store");
+  res.type("json").send(HEALTH_BODY);
 });
 
-function toMessages(messages: BaseMessage[]): Message[] {
-  return messages
-    .map((m) => ({
-      type: m.getType() as "human" | "ai",
-      content:
-        typeof m.content === "string" ? m.content : JSON.stringify(m.content),
-    }))
-    .filter((m): m is Message => m.type === "human" || m.type === "ai");
+/**
+ * Converts graph messages to the client format in a single pass, dropping
+ * tool/system messages and empty AI messages (e.g. tool-call-only turns).
+ */
+function toClientMessages(messages: BaseMessage[]): Message[] {
+  const clientMessages: Message[] = [];
+  for (const m of messages) {
+    const type = m.getType();
+    if (type !== "human" && type !== "ai") continue;
+
+    const content =
+      typeof m.content === "string" ? m.content : JSON.stringify(m.content);
+    if (type === "ai" && content.trim() === "") continue;
+
+    clientMessages.push({ type, content });
+  }
+  return clientMessages;
 }
 
-function filterForClient(messages: Message[]): Message[] {
-  return messages.filter((m) => {
-    if (m.type === "ai" && (!m.content || m.content.trim() === ""))
-      return false;
-    return true;
+/**
+ * Builds the graph input for a chat request, converting frontend messages
+ * to LangChain messages.
+ */
+function toGraphInput(request: ChatRequest) {
+  const conversation: BaseMessage[] = request.messages.map((m) => {
+    if (m.type === "human") {
+      return new HumanMessage(m.content);
+    }
+    return new AIMessage(m.content);
   });
+
+  return {
+    messages: conversation,
+    trip: normalizeTrip(request.trip),
+    data: request.data || null,
+  };
+}
+
+/**
+ * Builds the client response from the final graph state.
+ */
+function toChatResponse(
+  result: AgentStateType,
+  request: ChatRequest,
+): ChatResponse {
+  return {
+    messages: toClientMessages(result.messages),
+    data: result.data || null,
+    trip: result.trip || request.trip || createEmptyTrip(),
+  };
+}
+
+/**
+ * Names the top-level graph node a streamed token came from. Agents built
+ * with createReactAgent run as subgraphs, where langgraph_node is the inner
+ * node ("agent"); the first checkpoint_ns segment ("flightAgent:<id>|...")
+ * is the outer node that "updates" events report.
+ */
+function toOuterNodeName(
+  metadata: Record<string, unknown>,
+): string | undefined {
+  const namespace = metadata.langgraph_checkpoint_ns;
+  if (typeof namespace === "string" && namespace) {
+    return namespace.split("|")[0]!.split(":")[0];
+  }
+  const node = metadata.langgraph_node;
+  return typeof node === "string" ? node : undefined;
+}
+
+function isValidChatRequest(request: ChatRequest | undefined): boolean {
+  return !!request && Array.isArray(request.messages);
 }
 
 app.post("/chat", async (req: Request, res: Response) => {
   try {
-    const { messages: inputMessages, trip, data } = req.body as ChatRequest;
+    const request = req.body as ChatRequest;
 
-    if (!inputMessages || !Array.isArray(inputMessages)) {
+    if (!isValidChatRequest(request)) {
       res.status(400).json({
         error: "Invalid request. Expected { messages: Array, trip: Trip }",
       });
       return;
     }
 
-    // Convert frontend messages to LangChain messages
-    const conversation: BaseMessage[] = inputMessages.map((m) => {
-      if (m.type === "human") {
-        return new HumanMessage(m.content);
-      }
-      return new AIMessage(m.content);
-    });
-
     // Invoke graph with trip context
-    const result = await graph.invoke({
-      messages: conversation,
-      trip: trip || createEmptyTrip(),
-      data: data || null,
-    });
+    const result = await graphRuns.run(() =>
+      graph.invoke(toGraphInput(request)),
+    );
 
-    // Convert all messages to response format (filters out tool messages)
-    const allMessages = toMessages(result.messages);
+    res.json(toChatResponse(result, request));
+  } catch (error) {
+    console.error("Error processing chat:", error);
+    res.status(500).json({ error: "Internal server error" });
+  }
+});
 
-    // Filter messages for client (remove tool messages and empty AI messages)
-    const filteredMessages = filterForClient(allMessages);
+app.post("/chat/batch", async (req: Request, res: Response) => {
+  try {
+    const { requests } = req.body as ChatBatchRequest;
 
-    const response: ChatResponse = {
-      messages: filteredMessages,
-      data: result.data || null,
-      trip: result.trip || trip || createEmptyTrip(),
-    };
+    if (
+      !Array.isArray(requests) ||
+      requests.length === 0 ||
+      requests.length > MAX_BATCH_SIZE ||
+      !requests.every(isValidChatRequest)
+    ) {
+      res.status(400).json({
+        error: `Invalid request. Expected { requests: Array } of 1-${MAX_BATCH_SIZE} chat requests`,
+      });
+      return;
+    }
+
+    // Run up to BATCH_MAX_CONCURRENCY requests of this batch at once, each
+    // also taking a slot from the process-wide graphRuns limit. A failing
+    // request is returned as an error entry instead of failing the batch.
+    const batchRuns = createLimiter(BATCH_MAX_CONCURRENCY);
+    const responses = await Promise.all(
+      requests.map((request, i) =>
+        batchRuns
+          .run(() => graphRuns.run(() => graph.invoke(toGraphInput(request))))
+          .then(
+            (result) => toChatResponse(result, request),
+            (error) => {
+              console.error(`Error processing batch chat ${i}:`, error);
+              return { error: "Internal server error" };
+            },
+          ),
+      ),
+    );
+
+    const response: ChatBatchResponse = { responses };
 
     res.json(response);
   } catch (error) {
-    console.error("Error processing chat:", error);
+    console.error("Error processing chat batch:", error);
     res.status(500).json({ error: "Internal server error" });
   }
 });
 
+app.post("/chat/stream", async (req: Request, res: Response) => {
+  const request = req.body as ChatRequest;
+
+  if (!isValidChatRequest(request)) {
+    res.status(400).json({
+      error: "Invalid request. Expected { messages: Array, trip: Trip }",
+    });
+    return;
+  }
+
+  startSse(res);
+
+  // Stop the graph if the client goes away mid-run
+  const controller = new AbortController();
+  res.on("close", () => controller.abort());
+
+  try {
+    // "messages" carries LLM tokens as they are generated; "updates" reports
+    // each node as it finishes; "values" carries the full state, the last
+    // of which becomes the final response
+    const finalState = await graphRuns.run(async () => {
+      const stream = await graph.stream(toGraphInput(request), {
+        streamMode: ["messages", "updates", "values"],
+        signal: controller.signal,
+      });
+
+      let lastState: AgentStateType | undefined;
+      for await (const [mode, chunk] of stream) {
+        if (mode === "messages") {
+          // This mode also replays whole messages that nodes return (tool
+          // results, final replies); only model token chunks are forwarded.
+          // Tool-call chunks carry no text, and internal calls (intent
+          // classification, JSON generation) are tagged "nostream".
+          const [message, metadata] = chunk;
+          if (AIMessageChunk.isInstance(message) && message.text) {
+            writeSseEvent(res, "token", {
+              node: toOuterNodeName(metadata),
+              content: message.text,
+            });
+          }
+        } else if (mode === "updates") {
+          for (const node of Object.keys(chunk)) {
+            writeSseEvent(res, "node", { node });
+          }
+        } else {
+          lastState = chunk as AgentStateType;
+        }
+      }
+      return lastState;
+    });
+
+    if (finalState) {
+      writeSseEvent(res, "result", toChatResponse(finalState, request));
+    }
+  } catch (error) {
+    if (!controller.signal.aborted) {
+      console.error("Error streaming chat:", error);
+      writeSseEvent(res, "error", { error: "Internal server error" });
+    }
+  } finally {
+    res.end();
+  }
+});
+
 app.post("/tips", async (req: Request, res: Response) => {
   try {
     const { trip } = req.body as TipsRequest;
@@ -113,7 +305,9 @@ app.post("/tips", async (req: Request, res: Response) => {
       return;
     }
 
-    const tips = await generateTips(trip);
+    const tips = await graphRuns.run(() =>
+      generateTips(normalizeTrip(trip)),
+    );
 
     const response: TipsResponse = {
       data: {
@@ -133,4 +327,18 @@ app.post("/tips", async (req: Request, res: Response) => {
 app.listen(PORT, () => {
   console.log(`\nServer running on http://localhost:${PORT}`);
   console.log(`Press Ctrl+C to stop\n`);
+
+  // Fetch the Amadeus token up front so the first flight search
+  // doesn't pay for the OAuth round trip
+  if (USE_FLIGHT_API) {
+    getAmadeusToken().catch((error) => {
+      console.error("Failed to prefetch Amadeus token:", error);
+    });
+  }
+
+  // Index airports.json now rather than on the first flight or hotel
+  // request. A failure is logged and the next lookup retries the load.
+  preloadAirports().catch((error) => {
+    console.error("Failed to preload airports:", error);
+  });
 });
@@ -8,13 +8,127 @@ import type {
   CityInfo,
 } from "../../types/flight/flights.js";
 import { getAmadeusToken } from "../../utils/amadeus/tokenManager.js";
+import { discardBody } from "../../utils/http/discardBody.js";
+import { createTtlCache } from "../../utils/cache/ttlCache.js";
 import { validateAirportCode } from "./validateAirport.js";
-import {
-  searchWikipediaPageId,
-  fetchWikipediaCoordinates,
-} from "./searchWikipedia.js";
+import { searchWikipediaCoordinates } from "./searchWikipedia.js";
 import { nanoid } from "nanoid";
 
+const FLIGHT_OFFERS_URL =
+  "https://test.api.amadeus.com/v2/shopping/flight-offers";
+
+// Tool output: the JSON text the model reads, plus the same results as an
+// artifact so flightNode can use them without parsing the text back
+type SearchFlightsOutput = [string, FlightResults[]];
+
+// A shaped flight offer without its per-response id, deep-frozen so the
+// cached legs and segments can be shared between requests
+type CachedFlight = Readonly<Omit<FlightResults, "id">>;
+
+const INVALID_AIRPORT = Object.freeze({
+  error: true,
+  message: "Invalid Airport.",
+});
+const INVALID_AIRPORT_OUTPUT: [string, typeof INVALID_AIRPORT] = [
+  JSON.stringify(INVALID_AIRPORT),
+  INVALID_AIRPORT,
+];
+
+// Returned rather than thrown: ToolNode turns a thrown error into a plain
+// text message, which flightNode can't tell apart from any other failure
+const RATE_LIMITED = Object.freeze({
+  error: true,
+  message: "Flight search is busy right now. Please try again in a moment.",
+});
+const RATE_LIMITED_OUTPUT: [string, typeof RATE_LIMITED] = [
+  JSON.stringify(RATE_LIMITED),
+  RATE_LIMITED,
+];
+
+// The agent often repeats an identical search within a conversation (e.g.
+// after a clarifying turn), so non-empty results are kept briefly by
+// search parameters. Short TTL since fares change.
+const flightSearchCache = createTtlCache<string, readonly CachedFlight[]>({
+  maxSize: 100,
+  ttlMs: 5 * 60 * 1000, // 5 minutes
+});
+
+/**
+ * Deep-freezes a shaped flight (legs, segments and their endpoints) so it
+ * can be cached and shared. destinationAirport is already frozen by
+ * validateAirportCode.
+ */
+function freezeFlight(flight: Omit<FlightResults, "id">): CachedFlight {
+  for (const leg of flight.legs) {
+    for (const segment of leg.segments) {
+      Object.freeze(segment.departure);
+      Object.freeze(segment.arrival);
+      Object.freeze(segment);
+    }
+    Object.freeze(leg.segments);
+    Object.freeze(leg);
+  }
+  Object.freeze(flight.legs);
+  if (flight.destinationCity) Object.freeze(flight.destinationCity);
+  return Object.freeze(flight);
+}
+
+/**
+ * Builds the tool output for a set of flights, giving each a fresh id so
+ * cache hits never hand the same option ids to different conversations.
+ */
+function toSearchFlightsOutput(
+  flights: readonly CachedFlight[],
+): SearchFlightsOutput {
+  const results = flights.map((flight) => ({ id: nanoid(), ...flight }));
+  // Tool content must always be a string
+  return [JSON.stringify(results), results];
+}
+
+/**
+ * Fetches city-centre coordinates for a city name from Wikipedia.
+ * Returns null if the page or its coordinates cannot be found.
+ */
+async function fetchCityInfo(cityName: string): Promise<CityInfo | null> {
+  const coords = await searchWikipediaCoordinates(cityName);
+  if (!coords) return null;
+
+  return {
+    name: cityName,
+    latitude: coords.latitude,
+    longitude: coords.longitude,
+  };
+}
+
+/**
+ * Converts an Amadeus itinerary into a FlightLeg, resolving carrier codes
+ * to airline names via the response dictionary.
+ */
+function toFlightLeg(
+  itinerary: any,
+  direction: FlightLeg["direction"],
+  carrierMap: Record<string, string>,
+): FlightLeg {
+  return {
+    direction,
+    legDuration: itinerary.duration,
+    segments: itinerary.segments.map(
+      (flight: any): FlightSegment => ({
+        duration: flight.duration,
+        departure: {
+          airport: flight.departure.iataCode,
+          time: flight.departure.at,
+        },
+        arrival: {
+          airport: flight.arrival.iataCode,
+          time: flight.arrival.at,
+        },
+        airline: carrierMap[flight.carrierCode] ?? flight.carrierCode,
+      }),
+    ),
+  };
+}
+
 /**
  * IMPORTANT:
  * - Tool returns structured data
@@ -31,40 +145,40 @@ export const searchFlights = tool(
     includedAirlinesCodes,
     cityName,
   }) => {
+    // Normalize once so the cache key and the Amadeus query always agree
+    const origin = originLocationCode.toUpperCase();
+    const destination = destinationLocationCode.toUpperCase();
+    const cacheKey = JSON.stringify([
+      origin,
+      destination,
+      departureDate,
+      returnDate,
+      [...(includedAirlinesCodes ?? [])].sort(),
+      cityName,
+    ]);
+    const cached = flightSearchCache.get(cacheKey);
+    if (cached) return toSearchFlightsOutput(cached);
+
     let destinationAirportInfo: AirportInfo;
     try {
-      await validateAirportCode(originLocationCode);
-      destinationAirportInfo = await validateAirportCode(
-        destinationLocationCode,
-      );
+      [, destinationAirportInfo] = await Promise.all([
+        validateAirportCode(origin),
+        validateAirportCode(destination),
+      ]);
     } catch {
-      return JSON.stringify({ error: true, message: "Invalid Airport." });
+      return INVALID_AIRPORT_OUTPUT;
     }
 
-    // Fetch city-centre coordinates from Wikipedia when city name is provided
-    let destinationCityInfo: CityInfo | null = null;
-    if (cityName) {
-      const pageId = await searchWikipediaPageId(cityName);
-
-      if (pageId !== null) {
-        const coords = await fetchWikipediaCoordinates(pageId);
-        if (coords) {
-          destinationCityInfo = {
-            name: cityName,
-            latitude: coords.latitude,
-            longitude: coords.longitude,
-          };
-        }
-      }
-    }
+    // The city lookup and the Amadeus token are independent round trips,
+    // so run them concurrently instead of back to back
+    const [destinationCityInfo, token] = await Promise.all([
+      cityName ? fetchCityInfo(cityName) : Promise.resolve(null),
+      getAmadeusToken(),
+    ]);
 
-    const token = await getAmadeusToken();
-
-    const url = new URL(
-      "https://test.api.amadeus.com/v2/shopping/flight-offers",
-    );
-    url.searchParams.set("originLocationCode", originLocationCode);
-    url.searchParams.set("destinationLocationCode", destinationLocationCode);
+    const url = new URL(FLIGHT_OFFERS_URL);
+    url.searchParams.set("originLocationCode", origin);
+    url.searchParams.set("destinationLocationCode", destination);
     url.searchParams.set("departureDate", departureDate);
     url.searchParams.set("returnDate", returnDate);
     url.searchParams.set("max", String(5)); // Set a default of 5 results
@@ -100,20 +214,18 @@ export const searchFlights = tool(
     if (!response.ok) {
       // API error - don't expose technical details to user
       // Just throw a simple error that will be caught by the agent
+      await discardBody(response);
+      if (response.status === 429) return RATE_LIMITED_OUTPUT;
       throw new Error("Flight API unavailable");
     }
 
     const rawData = await response.json();
     const dictionary = rawData.dictionaries; // Contains the mapping between codes and real names
-    const carrierMap = dictionary?.carriers ?? [];
-
-    // Shape the results
-    const allFlightResults: FlightResults[] = [];
+    const carrierMap: Record<string, string> = dictionary?.carriers ?? {};
 
-    // Loop through the offers
-    for (const offer of rawData.data) {
-      const flightResults: FlightResults = {
-        id: nanoid(),
+    // Shape the results, one per offer
+    const allFlightResults: CachedFlight[] = rawData.data.map((offer: any) => {
+      const flightResults: Omit<FlightResults, "id"> = {
         price: 0,
         currency: "",
         legs: [],
@@ -123,90 +235,30 @@ export const searchFlights = tool(
 
       // const duration = offer.duration;
       const currency = offer.price.currency;
-      const price = offer.price.total;
+      const price = Number(offer.price.total); // Amadeus sends totals as decimal strings
 
       // flightResults.duration = duration;
       flightResults.price = price;
       flightResults.currency = currency;
 
-      // Get outbound itinerary
-      const outboundItinerary = offer.itineraries[0];
-
-      // Outbound Itinerary
-      const outboundLeg: FlightLeg = {
-        direction: "outbound",
-        legDuration: outboundItinerary.duration,
-        segments: [],
-      };
-      // Loop through the segments of the leg
-      for (const flight of outboundItinerary.segments) {
-        const duration = flight.duration;
-        const departure = flight.departure;
-        const arrival = flight.arrival;
-        const carrierCode = flight.carrierCode;
-
-        const airlineName = carrierMap[carrierCode] ?? carrierCode;
-
-        const flightSegment: FlightSegment = {
-          duration: duration,
-          departure: {
-            airport: departure.iataCode,
-            time: departure.at,
-          },
-          arrival: {
-            airport: arrival.iataCode,
-            time: arrival.at,
-          },
-          airline: airlineName,
-        };
-
-        outboundLeg.segments.push(flightSegment);
-      }
-      flightResults.legs.push(outboundLeg); // Add the outbound leg
-      allFlightResults.push(flightResults); // Add the result
-
-      // Get return itinerary
-      const returnItinerary = offer.itineraries[1];
-
-      // Outbound Itinerary
-      const returnLeg: FlightLeg = {
-        direction: "return",
-        legDuration: returnItinerary.duration,
-        segments: [],
-      };
-      // Loop through the segments of the leg
-      for (const flight of returnItinerary.segments) {
-        const duration = flight.duration;
-        const departure = flight.departure;
-        const arrival = flight.arrival;
-        const carrierCode = flight.carrierCode;
-
-        const airlineName = carrierMap[carrierCode] ?? carrierCode;
-
-        const flightSegment: FlightSegment = {
-          duration: duration,
-          departure: {
-            airport: departure.iataCode,
-            time: departure.at,
-          },
-          arrival: {
-            airport: arrival.iataCode,
-            time: arrival.at,
-          },
-          airline: airlineName,
-        };
-
-        returnLeg.segments.push(flightSegment);
-      }
-      flightResults.legs.push(returnLeg); // Add the outbound leg
-      allFlightResults.push(flightResults); // Add the result
-    }
+      // Build both legs with the same projection
+      flightResults.legs.push(
+        toFlightLeg(offer.itineraries[0], "outbound", carrierMap),
+        toFlightLeg(offer.itineraries[1], "return", carrierMap),
+      );
+      return freezeFlight(flightResults);
+    });
 
     // console.log(JSON.stringify(allFlightResults, null, 2));
-    return JSON.stringify(allFlightResults); // Tool must always return a string
+    // An empty result may be transient, so only real offers are cached
+    if (allFlightResults.length > 0) {
+      flightSearchCache.set(cacheKey, Object.freeze(allFlightResults));
+    }
+    return toSearchFlightsOutput(allFlightResults);
   },
   {
     name: "searchFlights",
+    responseFormat: "content_and_artifact",
     description: `
     Searches for the cheapest available round-trip flights between two airports.
 
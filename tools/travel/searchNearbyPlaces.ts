@@ -3,22 +3,52 @@ import type { RestaurantResults } from "../../types/restaurant/restaurants.js";
 import type { Activities } from "../../types/activities/activities.js";
 import type { Nature } from "../../types/nature/nature.js";
 import type { SelfieSpots } from "../../types/selfie/selfieSpots.js";
+import { FETCH_PLACES_PHOTOS } from "../../utils/config.js";
+import { discardBody } from "../../utils/http/discardBody.js";
+import { createTtlCache } from "../../utils/cache/ttlCache.js";
+import { createSingleFlight } from "../../utils/cache/singleFlight.js";
+import { createLimiter } from "../../utils/async/limiter.js";
 
 const PLACES_API_URL = "https://places.googleapis.com/v1/places:searchNearby";
 const RADIUS_METERS = 10000.0;
 const MAX_RESULTS = 10;
-const FETCH_PHOTO_CATEGORY = process.env.FETCH_PLACES_PHOTOS;
 
 type PlacesType = "hotel" | "restaurant" | "activities" | "nature" | "selfie";
 
+type PlacesResults =
+  | HotelResults[]
+  | RestaurantResults[]
+  | Activities[]
+  | Nature[]
+  | SelfieSpots[];
+
+// Coordinates are rounded to 4 decimal places (~11 m) for the cache key, so
+// repeat searches around the same hotel or destination share an entry
+const COORD_PRECISION = 4;
+
+const placesCache = createTtlCache<string, PlacesResults>({
+  maxSize: 500,
+  ttlMs: 10 * 60 * 1000, // 10 minutes
+});
+
+const placesSearches = createSingleFlight<string, PlacesResults>();
+
+// Caps in-flight Google requests for the whole process. Each search fans
+// out into up to MAX_RESULTS photo lookups, so batch and concurrent chats
+// could otherwise open hundreds of requests at once.
+const MAX_CONCURRENT_GOOGLE_REQUESTS = 16;
+const googleRequests = createLimiter(MAX_CONCURRENT_GOOGLE_REQUESTS);
+
 /** Configuration for each place type.
  * includedTypes: Array of place types to search for.
  * fieldMask: Field mask for the Google Place API of what types of data to return.
  */
 
-const typeConfig: Record<
-  PlacesType,
-  { includedTypes: string[]; fieldMask: string }
+const typeConfig: Readonly<
+  Record<
+    PlacesType,
+    { readonly includedTypes: readonly string[]; readonly fieldMask: string }
+  >
 > = {
   hotel: {
     includedTypes: ["hotel"],
@@ -53,6 +83,34 @@ const typeConfig: Record<
   },
 };
 
+const PLACES_API_KEY = process.env.GOOGLE_PLACES_API_KEY ?? "";
+
+// Request headers never change per type, so build them once at import
+const searchHeadersByType = Object.fromEntries(
+  Object.entries(typeConfig).map(([type, config]) => [
+    type,
+    {
+      "Content-Type": "application/json",
+      "X-Goog-Api-Key": PLACES_API_KEY,
+      "X-Goog-FieldMask": config.fieldMask,
+    },
+  ]),
+) as Record<PlacesType, Record<string, string>>;
+
+const PHOTO_HEADERS = { "X-Goog-Api-Key": PLACES_API_KEY };
+
+// Whether each place type fetches photos, resolved once from
+// FETCH_PLACES_PHOTOS instead of comparing strings for every place
+const fetchPhotosByType: Record<PlacesType, boolean> = {
+  hotel: FETCH_PLACES_PHOTOS === "hotel" || FETCH_PLACES_PHOTOS === "all",
+  restaurant:
+    FETCH_PLACES_PHOTOS === "restaurant" || FETCH_PLACES_PHOTOS === "all",
+  activities:
+    FETCH_PLACES_PHOTOS === "activity" || FETCH_PLACES_PHOTOS === "all",
+  nature: FETCH_PLACES_PHOTOS === "nature" || FETCH_PLACES_PHOTOS === "all",
+  selfie: FETCH_PLACES_PHOTOS === "selfie" || FETCH_PLACES_PHOTOS === "all",
+};
+
 interface GooglePlace {
   id: string;
   displayName?: { text: string };
@@ -65,74 +123,25 @@ interface GooglePlace {
   photos?: { name: string }[];
 }
 
-/**
- * Takes a Google Place and an image URL and returns a reshaped HotelResults object
- * @param {GooglePlace} place - Google Place API result
- * @param {string} imageUrl - URL of the hotel's photo
- * @returns {HotelResults} - Reshaped hotel result object
- */
-function reshapeHotel(place: GooglePlace, imageUrl: string): HotelResults {
-  return {
-    id: place.id,
-    name: place.displayName?.text ?? "",
-    location: place.formattedAddress ?? "",
-    ...(place.rating !== undefined && { rating: place.rating }),
-    ...(place.location?.latitude !== undefined && {
-      latitude: place.location.latitude,
-    }),
-    ...(place.location?.longitude !== undefined && {
-      longitude: place.location.longitude,
-    }),
-    description: place.editorialSummary?.text ?? "",
-    website: place.websiteUri ?? "",
-    imageUrl: imageUrl,
-  };
-}
-
-/**
- * Takes a Google Place and an image URL and returns a reshaped RestaurantResults object
- * @param {GooglePlace} place - Google Place API result
- * @param {string} imageUrl - URL of the restaurant's photo
- * @returns {RestaurantResults} - Reshaped restaurant result object
- */
-function reshapeRestaurant(
-  place: GooglePlace,
-  imageUrl: string,
-): RestaurantResults {
-  return {
-    id: place.id,
-    name: place.displayName?.text ?? "",
-    location: place.formattedAddress ?? "",
-    description: place.editorialSummary?.text ?? "",
-    website: place.websiteUri ?? "",
-    imageUrl: imageUrl,
-  };
-}
-
-/**
- * Takes a Google Place and an image URL and returns a reshaped Activities object
- * @param {GooglePlace} place - Google Place API result
- * @param {string} imageUrl - URL of the activity spot's photo
- * @returns {Activities} - Reshaped activity spot object
- */
-function reshapeActivity(place: GooglePlace, imageUrl: string): Activities {
-  return {
-    id: place.id,
-    name: place.displayName?.text ?? "",
-    location: place.formattedAddress ?? "",
-    description: place.editorialSummary?.text ?? "",
-    website: place.websiteUri ?? "",
-    imageUrl: imageUrl,
-  };
+/** Fields shared by every place result type */
+interface PlaceResult {
+  id: string;
+  name: string;
+  location: string;
+  description: string;
+  website: string;
+  imageUrl: string;
 }
 
 /**
- * Takes a Google Place and an image URL and returns a reshaped Nature object
+ * Takes a Google Place and an image URL and returns the fields shared by all
+ * place types. Restaurant, activity, nature and selfie results are exactly
+ * this shape, so they all use this one projection.
  * @param {GooglePlace} place - Google Place API result
- * @param {string} imageUrl - URL of the nature spot's photo
- * @returns {Nature} - Reshaped nature spot object
+ * @param {string} imageUrl - URL of the place's photo
+ * @returns {PlaceResult} - Reshaped place result object
  */
-function reshapeNature(place: GooglePlace, imageUrl: string): Nature {
+function reshapePlace(place: GooglePlace, imageUrl: string): PlaceResult {
   return {
     id: place.id,
     name: place.displayName?.text ?? "",
@@ -144,19 +153,21 @@ function reshapeNature(place: GooglePlace, imageUrl: string): Nature {
 }
 
 /**
- * Takes a Google Place and an image URL and returns a reshaped SelfieSpots object
+ * Takes a Google Place and an image URL and returns a reshaped HotelResults object
  * @param {GooglePlace} place - Google Place API result
- * @param {string} imageUrl - URL of the selfie spot's photo
- * @returns {SelfieSpots} - Reshaped selfie spot object
+ * @param {string} imageUrl - URL of the hotel's photo
+ * @returns {HotelResults} - Reshaped hotel result object
  */
-function reshapeSelfie(place: GooglePlace, imageUrl: string): SelfieSpots {
+function reshapeHotel(place: GooglePlace, imageUrl: string): HotelResults {
   return {
-    id: place.id,
-    name: place.displayName?.text ?? "",
-    location: place.formattedAddress ?? "",
-    description: place.editorialSummary?.text ?? "",
-    website: place.websiteUri ?? "",
-    imageUrl: imageUrl,
+    ...reshapePlace(place, imageUrl),
+    ...(place.rating !== undefined && { rating: place.rating }),
+    ...(place.location?.latitude !== undefined && {
+      latitude: place.location.latitude,
+    }),
+    ...(place.location?.longitude !== undefined && {
+      longitude: place.location.longitude,
+    }),
   };
 }
 
@@ -167,17 +178,21 @@ function reshapeSelfie(place: GooglePlace, imageUrl: string): SelfieSpots {
  */
 async function fetchPhotoUrl(photoName: string): Promise<string> {
   const googleUrl = `https://places.googleapis.com/v1/${photoName}/media?maxHeightPx=400`;
-  const response = await fetch(googleUrl, {
-    headers: {
-      "X-Goog-Api-Key": process.env.GOOGLE_PLACES_API_KEY ?? "",
-    },
-    redirect: "manual",
-  });
+  const response = await googleRequests.run(() =>
+    fetch(googleUrl, {
+      headers: PHOTO_HEADERS,
+      redirect: "manual",
+    }),
+  );
+  // Only the redirect target is needed; release the socket to the pool
+  await discardBody(response);
   return response.headers.get("Location") ?? "";
 }
 
 /**
- * Searches Google Places API for nearby places of a given type
+ * Searches Google Places API for nearby places of a given type.
+ * Results are cached for 10 minutes by type and rounded coordinates.
+ * @throws {Error} If GOOGLE_PLACES_API_KEY is not set
  * @param {PlacesType} type - Type of places to search for (hotel, restaurant, activities, nature, selfie)
  * @param {number} latitude - Latitude of the search location
  * @param {number} longitude - Longitude of the search location
@@ -188,9 +203,38 @@ export async function searchNearbyPlaces(params: {
   type: PlacesType;
   latitude: number;
   longitude: number;
-}): Promise<
-  HotelResults[] | RestaurantResults[] | Activities[] | Nature[] | SelfieSpots[]
-> {
+}): Promise<PlacesResults> {
+  // Without a key Google rejects every call; fail before the round trip
+  if (!PLACES_API_KEY) {
+    throw new Error("Missing GOOGLE_PLACES_API_KEY: must be set in .env");
+  }
+
+  const { type, latitude, longitude } = params;
+  const cacheKey = `${type}:${latitude.toFixed(COORD_PRECISION)},${longitude.toFixed(COORD_PRECISION)}`;
+
+  const cached = placesCache.get(cacheKey);
+  if (cached) return cached;
+
+  // Concurrent misses for the same key share one upstream request
+  return placesSearches.run(cacheKey, async () => {
+    // Cached results are shared by reference between requests, so freeze
+    // them rather than copying on every hit
+    const results = await fetchNearbyPlaces(params);
+    for (const place of results) Object.freeze(place);
+    Object.freeze(results);
+    placesCache.set(cacheKey, results);
+    return results;
+  });
+}
+
+/**
+ * Calls the Google Places API and reshapes the results for the given type.
+ */
+async function fetchNearbyPlaces(params: {
+  type: PlacesType;
+  latitude: number;
+  longitude: number;
+}): Promise<PlacesResults> {
   const { type, latitude, longitude } = params;
   const config = typeConfig[type];
 
@@ -205,93 +249,36 @@ export async function searchNearbyPlaces(params: {
     },
   };
 
-  const response = await fetch(PLACES_API_URL, {
-    method: "POST",
-    headers: {
-      "Content-Type": "application/json",
-      "X-Goog-Api-Key": process.env.GOOGLE_PLACES_API_KEY ?? "",
-      "X-Goog-FieldMask": config.fieldMask,
-    },
-    body: JSON.stringify(body),
-  });
+  const response = await googleRequests.run(() =>
+    fetch(PLACES_API_URL, {
+      method: "POST",
+      headers: searchHeadersByType[type],
+      body: JSON.stringify(body),
+    }),
+  );
 
   if (!response.ok) {
+    await discardBody(response);
+    if (response.status === 429) {
+      const retryAfter = response.headers.get("Retry-After") ?? "unknown";
+      throw new Error(
+        `Google Places API rate limited (retry after ${retryAfter}s)`,
+      );
+    }
     throw new Error(`Google Places API error: ${response.status}`);
   }
 
   const data = await response.json();
   const places: GooglePlace[] = data.places ?? [];
+  const fetchPhotos = fetchPhotosByType[type];
+  const reshape = type === "hotel" ? reshapeHotel : reshapePlace;
 
-  if (type === "hotel") {
-    return Promise.all(
-      places.map(async (place) => {
-        const photoName = place.photos?.[0]?.name;
-        const imageUrl =
-          (FETCH_PHOTO_CATEGORY === "hotel" ||
-            FETCH_PHOTO_CATEGORY === "all") &&
-          photoName
-            ? await fetchPhotoUrl(photoName)
-            : "";
-        return reshapeHotel(place, imageUrl);
-      }),
-    );
-  }
-
-  if (type === "restaurant") {
-    return Promise.all(
-      places.map(async (place) => {
-        const photoName = place.photos?.[0]?.name;
-        const imageUrl =
-          (FETCH_PHOTO_CATEGORY === "restaurant" ||
-            FETCH_PHOTO_CATEGORY === "all") &&
-          photoName
-            ? await fetchPhotoUrl(photoName)
-            : "";
-        return reshapeRestaurant(place, imageUrl);
-      }),
-    );
-  }
-
-  if (type === "activities") {
-    return Promise.all(
-      places.map(async (place) => {
-        const photoName = place.photos?.[0]?.name;
-        const imageUrl =
-          (FETCH_PHOTO_CATEGORY === "activity" ||
-            FETCH_PHOTO_CATEGORY === "all") &&
-          photoName
-            ? await fetchPhotoUrl(photoName)
-            : "";
-        return reshapeActivity(place, imageUrl);
-      }),
-    );
-  }
-
-  if (type === "nature") {
-    return Promise.all(
-      places.map(async (place) => {
-        const photoName = place.photos?.[0]?.name;
-        const imageUrl =
-          (FETCH_PHOTO_CATEGORY === "nature" ||
-            FETCH_PHOTO_CATEGORY === "all") &&
-          photoName
-            ? await fetchPhotoUrl(photoName)
-            : "";
-        return reshapeNature(place, imageUrl);
-      }),
-    );
-  }
-
-  // Returns Selfie Data
   return Promise.all(
     places.map(async (place) => {
       const photoName = place.photos?.[0]?.name;
       const imageUrl =
-        (FETCH_PHOTO_CATEGORY === "selfie" || FETCH_PHOTO_CATEGORY === "all") &&
-        photoName
-          ? await fetchPhotoUrl(photoName)
-          : "";
-      return reshapeSelfie(place, imageUrl);
+        fetchPhotos && photoName ? await fetchPhotoUrl(photoName) : "";
+      return reshape(place, imageUrl);
     }),
   );
 }
@@ -1,5 +1,15 @@
+import { discardBody } from "../../utils/http/discardBody.js";
+import { createTtlCache } from "../../utils/cache/ttlCache.js";
+
 const WIKI_API = "https://en.wikipedia.org/w/api.php";
 
+// Wikipedia lookups are read-only and shared by the flight and tips agents,
+// so successful responses are cached by request URL across turns
+const responseCache = createTtlCache<string, any>({
+  maxSize: 200,
+  ttlMs: 60 * 60 * 1000, // 1 hour
+});
+
 /** A section entry from the Wikipedia table of contents */
 export interface WikipediaSection {
   index: string;
@@ -20,6 +30,17 @@ export interface GroupedContent {
   whenToVisit: string[];
 }
 
+// Decoded in a single pass over the text rather than one scan per entity
+const HTML_ENTITIES: Record<string, string> = {
+  "&amp;": "&",
+  "&lt;": "<",
+  "&gt;": ">",
+  "&quot;": '"',
+  "&#039;": "'",
+  "&nbsp;": " ",
+};
+const HTML_ENTITY_PATTERN = /&(?:amp|lt|gt|quot|#039|nbsp);/g;
+
 /**
  * Strips HTML tags and replaces HTML entities with their corresponding
  * characters. Additionally, trims the string and replaces any
@@ -30,16 +51,44 @@ export interface GroupedContent {
 function stripHtml(html: string): string {
   return html
     .replace(/<[^>]+>/g, " ")
-    .replace(/&amp;/g, "&")
-    .replace(/&lt;/g, "<")
-    .replace(/&gt;/g, ">")
-    .replace(/&quot;/g, '"')
-    .replace(/&#039;/g, "'")
-    .replace(/&nbsp;/g, " ")
+    .replace(HTML_ENTITY_PATTERN, (entity) => HTML_ENTITIES[entity] ?? entity)
     .replace(/\s{2,}/g, " ")
     .trim();
 }
 
+/**
+ * Fetches a Wikipedia API URL and returns the parsed JSON body, serving
+ * repeat requests from the cache. Returns null on a non-2xx response;
+ * network errors are left for the caller to handle. API errors (ratelimited,
+ * maxlag, badvalue, ...) arrive as a 200 with an `error` object, so those
+ * bodies are returned but never cached.
+ */
+async function fetchWikiJson(url: string): Promise<any> {
+  const cached = responseCache.get(url);
+  if (cached !== undefined) return cached;
+
+  const response = await fetch(url);
+  if (!response.ok) {
+    await discardBody(response);
+    return null;
+  }
+
+  const data = await response.json();
+  if (!data?.error) responseCache.set(url, data);
+  return data;
+}
+
+/**
+ * Returns the first page of an action=query response, or undefined if the
+ * response has none. Every page query here targets a single page, so the
+ * page is taken directly rather than looked up by id.
+ */
+function firstQueryPage<T>(data: any): T | undefined {
+  const pages = data?.query?.pages as Record<string, T> | undefined;
+  for (const key in pages) return pages[key];
+  return undefined;
+}
+
 /**
  * Searches Wikipedia for the given query and returns the pageid of the first
  * result, or null if no results are found or the request fails.
@@ -50,9 +99,8 @@ export async function searchWikipediaPageId(
   const url = `${WIKI_API}?action=query&list=search&srsearch=${encodeURIComponent(query)}&format=json&origin=*`;
 
   try {
-    const response = await fetch(url);
-    if (!response.ok) return null;
-    const data = await response.json();
+    const data = await fetchWikiJson(url);
+    if (!data) return null;
     const results = data?.query?.search as
       | Array<{ pageid: number }>
       | undefined;
@@ -73,9 +121,8 @@ export async function fetchWikipediaSections(
   const url = `${WIKI_API}?action=parse&prop=tocdata&format=json&pageid=${pageId}&origin=*`;
 
   try {
-    const response = await fetch(url);
-    if (!response.ok) return [];
-    const data = await response.json();
+    const data = await fetchWikiJson(url);
+    if (!data) return [];
     const sections = data?.parse?.tocdata?.sections as
       | Array<{ index: string; line: string }>
       | undefined;
@@ -97,9 +144,8 @@ export async function fetchWikipediaSectionContent(
   const url = `${WIKI_API}?action=parse&prop=text&format=json&pageid=${pageId}&section=${sectionIndex}&origin=*`;
 
   try {
-    const response = await fetch(url);
-    if (!response.ok) return "";
-    const data = await response.json();
+    const data = await fetchWikiJson(url);
+    if (!data) return "";
     const html =
       (data?.parse?.text as Record<string, string> | undefined)?.["*"] ?? "";
     return stripHtml(html);
@@ -109,25 +155,23 @@ export async function fetchWikipediaSectionContent(
 }
 
 /**
- * Fetches the geographic coordinates of a Wikipedia page.
+ * Searches Wikipedia and returns the geographic coordinates of the top
+ * result in a single request, using the search as a generator for
+ * prop=coordinates instead of a search call followed by a coordinates call.
  * Returns { latitude, longitude } or null if unavailable or the request fails.
  */
-export async function fetchWikipediaCoordinates(
-  pageId: number,
+export async function searchWikipediaCoordinates(
+  query: string,
 ): Promise<{ latitude: number; longitude: number } | null> {
-  const url = `${WIKI_API}?action=query&prop=coordinates&pageids=${pageId}&format=json&origin=*`;
+  const url = `${WIKI_API}?action=query&generator=search&gsrsearch=${encodeURIComponent(query)}&gsrlimit=1&prop=coordinates&format=json&origin=*`;
 
   try {
-    const response = await fetch(url);
-
-    if (!response.ok) return null;
+    const data = await fetchWikiJson(url);
 
-    const data = await response.json();
-    const pages = data?.query?.pages as
-      | Record<string, { coordinates?: Array<{ lat: number; lon: number }> }>
-      | undefined;
-
-    const coords = pages?.[String(pageId)]?.coordinates?.[0];
+    // gsrlimit=1, so there is at most one page
+    const coords = firstQueryPage<{
+      coordinates?: Array<{ lat: number; lon: number }>;
+    }>(data)?.coordinates?.[0];
 
     if (!coords) return null;
 
@@ -148,13 +192,8 @@ export async function fetchWikipediaFullExtract(
   const url = `${WIKI_API}?action=query&prop=extracts&explaintext=true&format=json&pageids=${pageId}&origin=*`;
 
   try {
-    const response = await fetch(url);
-    if (!response.ok) return null;
-    const data = await response.json();
-    const pages = data?.query?.pages as
-      | Record<string, { extract?: string }>
-      | undefined;
-    return pages?.[String(pageId)]?.extract ?? null;
+    const data = await fetchWikiJson(url);
+    return firstQueryPage<{ extract?: string }>(data)?.extract ?? null;
   } catch {
     return null;
   }
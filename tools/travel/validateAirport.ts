@@ -1,15 +1,65 @@
 import { tool } from "@langchain/core/tools";
 import * as z from "zod";
-import { readFileSync } from "fs";
+import { readFile } from "fs/promises";
 import { fileURLToPath } from "url";
 import { dirname, join } from "path";
 
 import type { AirportInfo } from "../../types/flight/flights.js";
 
 const __dirname = dirname(fileURLToPath(import.meta.url));
-const airports: AirportInfo[] = JSON.parse(
-  readFileSync(join(__dirname, "../../data/airports/airports.json"), "utf-8"),
-) as AirportInfo[];
+const AIRPORTS_PATH = join(__dirname, "../../data/airports/airports.json");
+
+// airports.json is ~5 MB, so it is not read at import time. The server
+// starts the load via preloadAirports once it is listening; other callers
+// load it on their first lookup. Concurrent callers share the one load.
+let airportsByIataPromise: Promise<Map<string, AirportInfo>> | null = null;
+
+/**
+ * Loads airports.json and indexes it by upper-cased IATA code, so lookups
+ * are a single map read. The first entry wins for duplicate codes.
+ * Entries are trimmed to the AirportInfo fields and frozen up front, so
+ * lookups can return them directly instead of copying on every call.
+ */
+async function loadAirportsByIata(): Promise<Map<string, AirportInfo>> {
+  const airports = JSON.parse(
+    await readFile(AIRPORTS_PATH, "utf-8"),
+  ) as AirportInfo[];
+
+  const airportsByIata = new Map<string, AirportInfo>();
+  for (const airport of airports) {
+    const code = airport.iata_code?.toUpperCase();
+    if (code && !airportsByIata.has(code)) {
+      airportsByIata.set(
+        code,
+        Object.freeze({
+          name: airport.name,
+          iata_code: airport.iata_code,
+          latitude_deg: airport.latitude_deg,
+          longitude_deg: airport.longitude_deg,
+        }),
+      );
+    }
+  }
+  return airportsByIata;
+}
+
+/** Returns the shared airport index, starting the load if needed. */
+function getAirportsByIata(): Promise<Map<string, AirportInfo>> {
+  airportsByIataPromise ??= loadAirportsByIata().catch((error) => {
+    // Let the next lookup retry instead of caching the failure
+    airportsByIataPromise = null;
+    throw error;
+  });
+  return airportsByIataPromise;
+}
+
+/**
+ * Loads the airport index ahead of the first lookup, so no user request
+ * waits on reading and parsing airports.json.
+ */
+export async function preloadAirports(): Promise<void> {
+  await getAirportsByIata();
+}
 
 /**
  * Validates an airport code against the local airports.json data file.
@@ -18,20 +68,14 @@ const airports: AirportInfo[] = JSON.parse(
 export async function validateAirportCode(
   keyword: string,
 ): Promise<AirportInfo> {
-  const match = airports.find(
-    (airport) => airport.iata_code?.toUpperCase() === keyword.toUpperCase(),
-  );
+  const airportsByIata = await getAirportsByIata();
+  const match = airportsByIata.get(keyword.toUpperCase());
 
   if (!match) {
     throw new Error("Invalid Airport");
   }
 
-  return {
-    name: match.name,
-    iata_code: match.iata_code,
-    latitude_deg: match.latitude_deg,
-    longitude_deg: match.longitude_deg,
-  };
+  return match;
 }
 
 export const validateAirport = tool(
@@ -87,6 +87,14 @@ export interface ChatResponse {
   trip: Trip;
 }
 
+export interface ChatBatchRequest {
+  requests: ChatRequest[];
+}
+
+export interface ChatBatchResponse {
+  responses: (ChatResponse | { error: string })[];
+}
+
 export interface TipsRequest {
   data?: ResponseData | null;
   trip: Trip;
@@ -1 +1,12 @@
-export type Intent = "activities" | "arithmetic" | "flights" | "hotel" | "nature" | "restaurant" | "selfie" | "unsupported";
+export const INTENTS = [
+  "activities",
+  "arithmetic",
+  "flights",
+  "hotel",
+  "nature",
+  "restaurant",
+  "selfie",
+  "unsupported",
+] as const;
+
+export type Intent = (typeof INTENTS)[number];
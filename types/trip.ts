@@ -14,6 +14,21 @@ export interface Trip {
   hotelCoords: { latitude: number; longitude: number } | null;
 }
 
+/**
+ * Fills any fields missing from a client-supplied trip with their empty
+ * defaults, so agents can rely on the full Trip shape (e.g. that
+ * interests is always an array). The array fields are also coalesced,
+ * since a client may send them as an explicit null.
+ */
+export function normalizeTrip(trip: Partial<Trip> | null | undefined): Trip {
+  return {
+    ...createEmptyTrip(),
+    ...trip,
+    interests: trip?.interests ?? [],
+    constraints: trip?.constraints ?? [],
+  };
+}
+
 export function createEmptyTrip(): Trip {
   return {
     origin: null,
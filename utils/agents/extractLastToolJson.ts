@@ -1,20 +1,30 @@
 import type { BaseMessage } from "@langchain/core/messages";
+import { ToolMessage } from "@langchain/core/messages";
 
 /**
  * Scans message history to find most recent tool message.
- * Assumes the tool returned JSON as a string.
- * Parses and returns the JSON.
+ * If the tool attached an artifact (responseFormat "content_and_artifact"),
+ * returns it as is. Otherwise assumes the tool returned JSON as a string,
+ * and parses and returns the JSON.
  *
  * @param messages
  * @returns
  */
 export function extractLastToolJson<T>(messages: BaseMessage[]): T {
-  const toolMessage = [...messages].reverse().find((m) => m.type === "tool");
+  const toolMessage = messages.findLast((m) => m.type === "tool");
 
   if (!toolMessage) {
     throw new Error("No tool output found");
   }
 
+  // The artifact is already the structured result; no need to re-parse
+  if (
+    ToolMessage.isInstance(toolMessage) &&
+    toolMessage.artifact !== undefined
+  ) {
+    return toolMessage.artifact as T;
+  }
+
   const raw = toolMessage.content;
 
   // content can be a string or an array of content blocks
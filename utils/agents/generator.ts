@@ -1,7 +1,22 @@
 import { SystemMessage, HumanMessage } from "@langchain/core/messages";
 import { loadModel } from "./loadModel.js";
+import { parseModelJson } from "./parseModelJson.js";
 
-const model = loadModel("smart");
+const model = await loadModel("smart");
+
+const generatorSystemMessage = new SystemMessage(`You are a data generator assistant.
+
+You will receive:
+1. A JSON data template with some null values
+2. Context information to guide your generation
+
+Your task:
+- Fill ONLY the null values with contextually appropriate data
+- NEVER modify fields that already have non-null values
+- Use the provided context to make generated values relevant and realistic
+- Return valid JSON only, no markdown, no explanations
+- Always return a JSON array, even for a single item
+- Match the exact structure and field names of the input template`);
 
 interface GeneratorOptions<T> {
   /** Data template(s) with null values to be filled. Can be a single object or array. */
@@ -33,21 +48,10 @@ export async function generator<T extends object>(
     .filter(([, v]) => v === null)
     .map(([k]) => k);
 
-  const response = await model.invoke([
-    new SystemMessage(`You are a data generator assistant.
-
-You will receive:
-1. A JSON data template with some null values
-2. Context information to guide your generation
-
-Your task:
-- Fill ONLY the null values with contextually appropriate data
-- NEVER modify fields that already have non-null values
-- Use the provided context to make generated values relevant and realistic
-- Return valid JSON only, no markdown, no explanations
-- Always return a JSON array, even for a single item
-- Match the exact structure and field names of the input template`),
-    new HumanMessage(`Description: ${options.description}
+  const response = await model.invoke(
+    [
+      generatorSystemMessage,
+      new HumanMessage(`Description: ${options.description}
 
 Context:
 ${JSON.stringify(options.context, null, 2)}
@@ -56,20 +60,12 @@ Data template (fields to fill: ${nullFields.join(", ")}):
 ${JSON.stringify(dataArray, null, 2)}
 
 Return ONLY a JSON array with null values filled in.`),
-  ]);
-
-  const text = (response.content as string).trim();
-  let parsed: T[];
+    ],
+    // The raw JSON is not a chat reply, so keep it off /chat/stream
+    { tags: ["nostream"] },
+  );
 
-  try {
-    parsed = JSON.parse(text);
-  } catch {
-    // Try stripping markdown code fences
-    const stripped = text
-      .replace(/^```(?:json)?\s*\n?/i, "")
-      .replace(/\n?```\s*$/i, "");
-    parsed = JSON.parse(stripped);
-  }
+  let parsed = parseModelJson<T[]>(response.content as string);
 
   if (!Array.isArray(parsed)) {
     parsed = [parsed];
@@ -1,12 +1,22 @@
-import { ChatOpenAI } from "@langchain/openai";
-import { ChatGoogleGenerativeAI } from "@langchain/google-genai";
-import { ChatOllama } from "@langchain/ollama";
 import type { BaseChatModel } from "@langchain/core/language_models/chat_models";
+import { InMemoryCache } from "@langchain/core/caches";
+import { LLM_CACHE, OLLAMA_KEEP_ALIVE } from "../config.js";
 
 export type ModelTier = "fast" | "standard" | "smart";
 
+// Keyed by "company:model", so tiers configured with the same model share
+// one client (and its HTTP connection pool) instead of one per tier
+const modelCache = new Map<string, Promise<BaseChatModel>>();
+
+// Shared by every tier when LLM_CACHE=true; keyed by prompt and model params
+const llmCache = LLM_CACHE ? new InMemoryCache() : undefined;
+
 /**
  * Dynamically loads an LLM based on environment variables for the given tier.
+ * Models are cached by company and model name, so every node using the same
+ * model shares one client, even across tiers.
+ * Provider SDKs are imported on first use, so only the providers actually
+ * configured are loaded at startup.
  *
  * Required env vars per tier (e.g. for "smart"):
  *   SMART_MODEL_COMPANY=OpenAI | GoogleGemini | Ollama
@@ -17,34 +27,59 @@ export type ModelTier = "fast" | "standard" | "smart";
  *   standard → arithmeticNode, summarizeFlights (moderate reasoning)
  *   smart    → all travel-planning nodes + generator (full generation)
  */
-export function loadModel(tier: ModelTier): BaseChatModel {
+export function loadModel(tier: ModelTier): Promise<BaseChatModel> {
   const prefix = tier.toUpperCase();
   const company = process.env[`${prefix}_MODEL_COMPANY`];
   const modelName = process.env[`${prefix}_MODEL_NAME`];
 
   if (!company || !modelName) {
-    throw new Error(
-      `Missing env vars: ${prefix}_MODEL_COMPANY and ${prefix}_MODEL_NAME must both be set.`,
+    return Promise.reject(
+      new Error(
+        `Missing env vars: ${prefix}_MODEL_COMPANY and ${prefix}_MODEL_NAME must both be set.`,
+      ),
     );
   }
 
+  const key = `${company}:${modelName}`;
+  const cached = modelCache.get(key);
+  if (cached) return cached;
+
+  const model = createModel(company, modelName);
+  modelCache.set(key, model);
+  return model;
+}
+
+async function createModel(
+  company: string,
+  modelName: string,
+): Promise<BaseChatModel> {
   switch (company) {
-    case "OpenAI":
+    case "OpenAI": {
+      const { ChatOpenAI } = await import("@langchain/openai");
       return new ChatOpenAI({
         model: modelName,
         temperature: 1, // temperature: 1 is required for gpt-5-nano and valid for all OpenAI models
         maxRetries: 2,
+        ...(llmCache && { cache: llmCache }),
       });
-    case "GoogleGemini":
+    }
+    case "GoogleGemini": {
+      const { ChatGoogleGenerativeAI } = await import("@langchain/google-genai");
       return new ChatGoogleGenerativeAI({
         model: modelName,
         temperature: 0,
+        ...(llmCache && { cache: llmCache }),
       });
-    case "Ollama":
+    }
+    case "Ollama": {
+      const { ChatOllama } = await import("@langchain/ollama");
       return new ChatOllama({
         model: modelName,
         temperature: 0,
+        keepAlive: OLLAMA_KEEP_ALIVE,
+        ...(llmCache && { cache: llmCache }),
       });
+    }
     default:
       throw new Error(
         `Unknown MODEL_COMPANY "${company}". Valid values: OpenAI, GoogleGemini, Ollama`,
@@ -0,0 +1,22 @@
+/**
+ * Parses JSON returned by an LLM, tolerating a surrounding markdown code
+ * fence (```json ... ```).
+ *
+ * Valid JSON can never begin or end with a fence, so the fences are stripped
+ * up front and the text is parsed once, instead of letting a first
+ * JSON.parse throw and retrying. Text that already starts like JSON (the
+ * usual case) skips the fence regexes entirely.
+ *
+ * @throws {SyntaxError} If the text is not valid JSON after stripping fences
+ */
+export function parseModelJson<T>(text: string): T {
+  const trimmed = text.trim();
+  if (trimmed[0] === "{" || trimmed[0] === "[") {
+    return JSON.parse(trimmed) as T;
+  }
+
+  const stripped = trimmed
+    .replace(/^```(?:json)?\s*\n?/i, "")
+    .replace(/\n?```\s*$/i, "");
+  return JSON.parse(stripped) as T;
+}
@@ -1,4 +1,5 @@
 import "dotenv/config";
+import { discardBody } from "../http/discardBody.js";
 
 interface AmadeusTokenResponse {
   type: string;
@@ -14,9 +15,17 @@ interface AmadeusTokenResponse {
 
 let cachedToken: string | null = null;
 let tokenExpiresAt: number = 0;
+let refreshPromise: Promise<string> | null = null;
 
 const BUFFER_MS = 5 * 60 * 1000; // 5 minutes
 
+const TOKEN_URL = "https://test.api.amadeus.com/v1/security/oauth2/token";
+
+// Credentials are read once at import; dotenv is loaded above
+const CLIENT_ID = process.env.AMADEUS_CLIENT_ID;
+const CLIENT_SECRET = process.env.AMADEUS_CLIENT_SECRET;
+const GRANT_TYPE = process.env.AMADEUS_GRANT_TYPE;
+
 /**
  * Fetches an Amadeus API token using the provided credentials.
  *
@@ -25,32 +34,26 @@ const BUFFER_MS = 5 * 60 * 1000; // 5 minutes
  * @returns A promise that resolves to an AmadeusTokenResponse object
  */
 async function fetchAmadeusToken(): Promise<AmadeusTokenResponse> {
-  const clientId = process.env.AMADEUS_CLIENT_ID;
-  const clientSecret = process.env.AMADEUS_CLIENT_SECRET;
-  const grantType = process.env.AMADEUS_GRANT_TYPE;
-
-  if (!clientId || !clientSecret || !grantType) {
+  if (!CLIENT_ID || !CLIENT_SECRET || !GRANT_TYPE) {
     throw new Error(
       "Missing Amadeus credentials: AMADEUS_CLIENT_ID, AMADEUS_CLIENT_SECRET, and AMADEUS_GRANT_TYPE must be set in .env",
     );
   }
 
-  const response = await fetch(
-    "https://test.api.amadeus.com/v1/security/oauth2/token",
-    {
-      method: "POST",
-      headers: {
-        "Content-Type": "application/x-www-form-urlencoded",
-      },
-      body: new URLSearchParams({
-        client_id: clientId,
-        client_secret: clientSecret,
-        grant_type: grantType,
-      }),
+  const response = await fetch(TOKEN_URL, {
+    method: "POST",
+    headers: {
+      "Content-Type": "application/x-www-form-urlencoded",
     },
-  );
+    body: new URLSearchParams({
+      client_id: CLIENT_ID,
+      client_secret: CLIENT_SECRET,
+      grant_type: GRANT_TYPE,
+    }),
+  });
 
   if (!response.ok) {
+    await discardBody(response);
     throw new Error(
       `Amadeus token request failed: ${response.status} ${response.statusText}`,
     );
@@ -63,16 +66,29 @@ async function fetchAmadeusToken(): Promise<AmadeusTokenResponse> {
  * Retrieves an Amadeus API token. If a valid token is already cached, it will be returned.
  * Otherwise, a new token will be fetched and cached for future use.
  * The token will be cached for 5 minutes less than its actual expiration time to avoid
- * any potential race conditions.
+ * any potential race conditions. Concurrent calls while a refresh is in flight
+ * wait on that refresh rather than requesting their own token.
  *
  * @returns A promise that resolves to an Amadeus API token string
  */
 export async function getAmadeusToken(): Promise<string> {
   if (cachedToken && Date.now() < tokenExpiresAt) {
-    console.log("Using cached Amadeus token");
     return cachedToken;
   }
 
+  // Concurrent callers during a refresh share one token request
+  refreshPromise ??= refreshAmadeusToken().finally(() => {
+    refreshPromise = null;
+  });
+  return refreshPromise;
+}
+
+/**
+ * Fetches a new token and stores it in the cache.
+ *
+ * @returns A promise that resolves to the new Amadeus API token string
+ */
+async function refreshAmadeusToken(): Promise<string> {
   const tokenResponse = await fetchAmadeusToken();
   console.log("Generated new Amadeus token");
 
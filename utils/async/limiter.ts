@@ -0,0 +1,36 @@
+export interface Limiter {
+  /** Runs `fn` once fewer than the limit of calls are active, in FIFO order. */
+  run<T>(fn: () => Promise<T>): Promise<T>;
+}
+
+/**
+ * Creates a counting semaphore that caps how many calls run at once.
+ * Calls beyond the limit wait in a queue and start as earlier ones settle.
+ */
+export function createLimiter(maxConcurrent: number): Limiter {
+  let active = 0;
+  const queue: (() => void)[] = [];
+
+  // Hand the slot straight to the next waiter so a new caller can't slip
+  // in between the release and the waiter resuming
+  function release(): void {
+    const next = queue.shift();
+    if (next) next();
+    else active--;
+  }
+
+  return {
+    async run(fn) {
+      if (active >= maxConcurrent) {
+        await new Promise<void>((resolve) => queue.push(resolve));
+      } else {
+        active++;
+      }
+      try {
+        return await fn();
+      } finally {
+        release();
+      }
+    },
+  };
+}
@@ -0,0 +1,27 @@
+export interface SingleFlight<K, V> {
+  /**
+   * Runs `fn` for `key`, or joins the call already in flight for that key.
+   * The key is released once the call settles, so later calls run again.
+   */
+  run(key: K, fn: () => Promise<V>): Promise<V>;
+}
+
+/**
+ * Creates a single-flight group that collapses concurrent calls for the same
+ * key into one underlying call. Pairs with createTtlCache: the cache serves
+ * repeats after a result lands, this covers the window while it is pending.
+ */
+export function createSingleFlight<K, V>(): SingleFlight<K, V> {
+  const inFlight = new Map<K, Promise<V>>();
+
+  return {
+    run(key, fn) {
+      const pending = inFlight.get(key);
+      if (pending) return pending;
+
+      const call = fn().finally(() => inFlight.delete(key));
+      inFlight.set(key, call);
+      return call;
+    },
+  };
+}
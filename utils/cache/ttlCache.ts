@@ -0,0 +1,56 @@
+export interface TtlCache<K, V> {
+  /** Returns the cached value, or undefined if missing or expired. */
+  get(key: K): V | undefined;
+  /** Stores a value, evicting the least recently used entry when full. */
+  set(key: K, value: V): void;
+  /** Removes every entry. */
+  clear(): void;
+}
+
+interface CacheEntry<V> {
+  value: V;
+  expiresAt: number;
+}
+
+/**
+ * Creates a bounded in-process cache where every entry expires after `ttlMs`.
+ *
+ * A Map keeps keys in insertion order, so re-inserting on read keeps the
+ * least recently used key at the front, where it is evicted first once
+ * `maxSize` is reached.
+ */
+export function createTtlCache<K, V>(options: {
+  maxSize: number;
+  ttlMs: number;
+}): TtlCache<K, V> {
+  const entries = new Map<K, CacheEntry<V>>();
+
+  return {
+    get(key) {
+      const entry = entries.get(key);
+      if (!entry) return undefined;
+
+      if (Date.now() >= entry.expiresAt) {
+        entries.delete(key);
+        return undefined;
+      }
+
+      entries.delete(key);
+      entries.set(key, entry);
+      return entry.value;
+    },
+
+    set(key, value) {
+      entries.delete(key);
+      if (entries.size >= options.maxSize) {
+        const oldest = entries.keys().next();
+        if (!oldest.done) entries.delete(oldest.value);
+      }
+      entries.set(key, { value, expiresAt: Date.now() + options.ttlMs });
+    },
+
+    clear() {
+      entries.clear();
+    },
+  };
+}
@@ -0,0 +1,62 @@
+import "dotenv/config";
+
+/**
+ * Feature flags and server settings, parsed once from the environment.
+ * Import these instead of re-reading process.env in each module.
+ * See .env.example for the accepted values.
+ */
+export const PORT = process.env.PORT || 8000;
+
+/** "true" = Amadeus flight data; otherwise LLM-generated flights. */
+export const USE_FLIGHT_API = process.env.USE_FLIGHT_API === "true";
+
+/** "true" = Google Places venue data; otherwise LLM-generated places. */
+export const USE_PLACES_API = process.env.USE_PLACES_API === "true";
+
+/** "true" = agents produce a conversational summary of their results. */
+export const GENERATE_SUMMARIES = process.env.GENERATE_SUMMARIES === "true";
+
+/**
+ * "true" = identical LLM prompts are answered from an in-memory cache.
+ * Meant for development and repeated evaluation runs; unbounded, so leave
+ * it off in production.
+ */
+export const LLM_CACHE = process.env.LLM_CACHE === "true";
+
+/**
+ * Max graph steps a react agent may take per turn (each model call and each
+ * tool round counts as one). Caps runaway tool loops well below LangGraph's
+ * default of 25.
+ */
+export const AGENT_RECURSION_LIMIT =
+  Number(process.env.AGENT_RECURSION_LIMIT) || 10;
+
+/**
+ * How long a local Ollama server keeps the model loaded after a request
+ * (e.g. "30m", "-1" for forever). Ollama's own default of 5 minutes means a
+ * quiet server reloads the weights on the next chat, adding seconds of
+ * latency to it.
+ */
+export const OLLAMA_KEEP_ALIVE = process.env.OLLAMA_KEEP_ALIVE || "30m";
+
+const LOG_LEVELS = ["debug", "info", "warn", "error"] as const;
+type LogLevel = (typeof LOG_LEVELS)[number];
+
+/**
+ * Minimum level for request logging: debug | info | warn | error.
+ * Defaults to "info"; "debug" also logs request bodies, and "warn" in
+ * production skips per-request logs.
+ */
+export const LOG_LEVEL: LogLevel = LOG_LEVELS.includes(
+  process.env.LOG_LEVEL as LogLevel,
+)
+  ? (process.env.LOG_LEVEL as LogLevel)
+  : "info";
+
+/** True if messages at `level` should be logged under LOG_LEVEL. */
+export function isLogLevelEnabled(level: LogLevel): boolean {
+  return LOG_LEVELS.indexOf(level) >= LOG_LEVELS.indexOf(LOG_LEVEL);
+}
+
+/** Which place category fetches Google photos: all | none | hotel | ... */
+export const FETCH_PLACES_PHOTOS = process.env.FETCH_PLACES_PHOTOS ?? "none";
@@ -0,0 +1,48 @@
+import { gzip } from "node:zlib";
+import { promisify } from "node:util";
+import type { Request, Response, NextFunction } from "express";
+
+const gzipAsync = promisify(gzip);
+
+// Below this size the gzip header and CPU cost outweigh the savings
+const MIN_COMPRESS_BYTES = 1024;
+
+const JSON_CONTENT_TYPE = "application/json; charset=utf-8";
+
+/**
+ * Express middleware that gzips res.json() bodies of at least
+ * MIN_COMPRESS_BYTES when the client accepts gzip. Place and flight results
+ * are repetitive JSON that typically shrinks by 70-90%. Only res.json is
+ * wrapped, so streamed responses (SSE) are left untouched.
+ */
+export function compressJson(
+  req: Request,
+  res: Response,
+  next: NextFunction,
+): void {
+  res.vary("Accept-Encoding");
+
+  if (!req.acceptsEncodings("gzip")) {
+    next();
+    return;
+  }
+
+  res.json = (body: unknown) => {
+    const payload = Buffer.from(JSON.stringify(body));
+    res.set("Content-Type", JSON_CONTENT_TYPE);
+
+    if (payload.length < MIN_COMPRESS_BYTES) {
+      return res.send(payload);
+    }
+
+    gzipAsync(payload)
+      .then((compressed) => {
+        res.set("Content-Encoding", "gzip");
+        res.send(compressed);
+      })
+      .catch(next);
+    return res;
+  };
+
+  next();
+}
@@ -0,0 +1,12 @@
+/**
+ * Discards an unread response body.
+ *
+ * Node's fetch (undici) keeps a pooled keep-alive socket busy until the body
+ * is consumed or cancelled. Calling this on paths that never read the body
+ * (error branches, redirects) lets the socket be reused by the next request
+ * instead of waiting for garbage collection and forcing a fresh TCP/TLS
+ * handshake.
+ */
+export async function discardBody(response: Response): Promise<void> {
+  await response.body?.cancel();
+}
@@ -0,0 +1,21 @@
+import type { Response } from "express";
+
+/**
+ * Starts a Server-Sent Events response and flushes the headers immediately,
+ * so the client sees the stream open before the first event is ready.
+ */
+export function startSse(res: Response): void {
+  res.writeHead(200, {
+    "Content-Type": "text/event-stream",
+    "Cache-Control": "no-cache",
+    Connection: "keep-alive",
+  });
+  res.flushHeaders();
+}
+
+/**
+ * Writes a single named Server-Sent Event with a JSON payload.
+ */
+export function writeSseEvent(res: Response, event: string, data: unknown): void {
+  res.write(`event: ${event}\ndata: ${JSON.stringify(data)}\n\n`);
+}